@@ -1,10 +1,78 @@
 import os
+import weakref
 import tensorflow as tf
 
 
 estimator_dir = os.path.join(os.path.dirname(__file__), 'estimator')
 
 
+def _warm_checkpoint_cache(checkpoint_path):
+    """
+    Advise the kernel to prefetch checkpoint files into the page cache.
+
+    Purely advisory cache warming: `posix_fadvise(WILLNEED)` is issued for
+    each shard so the kernel reads them ahead asynchronously while
+    tensorflow parses the checkpoint index, and the eventual restore hits
+    page cache instead of disk. A no-op when `checkpoint_path` is None or
+    the platform lacks `posix_fadvise` (e.g. windows).
+    """
+    import glob
+    if checkpoint_path is None or not hasattr(os, 'posix_fadvise'):
+        return
+    paths = glob.glob('%s.data-*' % checkpoint_path)
+    paths.append('%s.index' % checkpoint_path)
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+
+
+def _prefetched(iterable, buffer_size=2):
+    """
+    Iterate over `iterable`, producing elements on a background thread.
+
+    Used in visualization loops to overlap fetching the next batch with the
+    (potentially slow) visualization callback for the current one. Up to
+    `buffer_size` elements are buffered; consumption stays on the calling
+    thread, which keeps GUI backends like matplotlib happy. Exceptions
+    raised by the producer are re-raised on the calling thread rather than
+    dying silently on the background one.
+    """
+    import threading
+    try:
+        import queue
+    except ImportError:
+        import Queue as queue  # python 2
+    buffered = queue.Queue(maxsize=buffer_size)
+    sentinel = object()
+    errors = []
+
+    def produce():
+        try:
+            for element in iterable:
+                buffered.put(element)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            buffered.put(sentinel)
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+    while True:
+        element = buffered.get()
+        if element is sentinel:
+            break
+        yield element
+    thread.join()
+    if errors:
+        raise errors[0]
+
+
 class ModelBuilder(object):
     """
     Abstract base class for building models.
@@ -32,6 +100,13 @@ class ModelBuilder(object):
     def __init__(self, model_id, params):
         self._model_id = model_id
         self._params = params
+        self._estimator_cache = {}
+        self._graph_caches = weakref.WeakKeyDictionary()
+        self._spec_fns = {
+            tf.estimator.ModeKeys.PREDICT: self._get_predict_spec,
+            tf.estimator.ModeKeys.EVAL: self._get_eval_spec,
+            tf.estimator.ModeKeys.TRAIN: self._get_train_spec,
+        }
 
     @property
     def model_id(self):
@@ -95,6 +170,59 @@ class ModelBuilder(object):
         """
         raise NotImplementedError('Abstract method')
 
+    def get_train_map_fn(self):
+        """
+        Optional preprocessing function mapped over training examples.
+
+        If not None, it is fused with batching via
+        `tf.data.experimental.map_and_batch` with
+        `num_parallel_calls=AUTOTUNE`, which pipelines copies into the
+        output batch instead of dispatching per element and scales worker
+        threads to saturate available cores.
+
+        Subclasses reading from many files should also consider
+        `dataset.interleave(..., num_parallel_calls=AUTOTUNE)` inside their
+        `get_*_dataset` implementations for parallel file reads.
+
+        Defaults to None (no mapping).
+        """
+        return None
+
+    def get_eval_map_fn(self):
+        """
+        Optional preprocessing function mapped over eval examples.
+
+        If not None, it is applied with `num_parallel_calls=AUTOTUNE`.
+        Defaults to None (no mapping).
+        """
+        return None
+
+    def get_predict_map_fn(self):
+        """
+        Optional preprocessing function mapped over predict examples.
+
+        If not None, it is applied with `num_parallel_calls=AUTOTUNE`.
+        Defaults to None (no mapping).
+        """
+        return None
+
+    def get_vectorized_map_fn(self):
+        """
+        Optional preprocessing function applied to whole training batches.
+
+        Unlike `get_train_map_fn`, this is mapped *after* batching, so
+        implementations operate on batch tensors and pay python/op dispatch
+        once per batch rather than once per example. Prefer this for simple
+        numeric preprocessing that vectorizes trivially.
+
+        Alternatively set `params['vectorize_maps']` to let tf.data's
+        map_vectorization optimization rewrite `.map(f).batch(b)` pipelines
+        into `.batch(b).map(pfor(f))` automatically.
+
+        Defaults to None (no mapping).
+        """
+        return None
+
     def vis_example_data(self, feature_data, label_data):
         """
         Function for visualizing a batch of data for training or evaluation.
@@ -127,79 +255,295 @@ class ModelBuilder(object):
         """Get evaluation metrics. Defaults to empty dictionary."""
         return dict()
 
+    def _graph_cache(self, name):
+        """
+        Get the cache dict named `name` for the current default graph.
+
+        Graphs are held weakly: estimators build a fresh graph per
+        train/eval/predict call, so strong keys would pin every graph the
+        builder ever touched (and everything cached on it) for the
+        builder's lifetime. Entries die with their graph instead.
+        """
+        graph = tf.get_default_graph()
+        caches = self._graph_caches.get(graph)
+        if caches is None:
+            caches = {}
+            self._graph_caches[graph] = caches
+        return caches.setdefault(name, {})
+
+    def _get_cached_collection(self, key):
+        """
+        Memoized `tf.get_collection`, keyed by the current default graph.
+
+        Collection lookups walk the full collection each call; spec builders
+        may be invoked repeatedly on the same graph (and re-traced when
+        inference is wrapped in `tf.function`), so the result is cached per
+        (collection key, graph).
+        """
+        cache = self._graph_cache('collections')
+        if key not in cache:
+            cache[key] = tf.get_collection(key)
+        return cache[key]
+
     def get_total_loss(self, inference_loss):
         """
         Get total loss, combining inference loss and regularization losses.
 
         If no regularization losses, just returns the inference loss.
+
+        Sub-loss summaries (evaluated every training step) are only added
+        when `params['enable_reg_summaries']` is True.
         """
-        reg_losses = tf.get_collection(tf.GraphKeys.REGULARIZATION_LOSSES)
-        if len(reg_losses) > 0:
+        reg_losses = self._get_cached_collection(
+            tf.GraphKeys.REGULARIZATION_LOSSES)
+        if len(reg_losses) == 0:
+            return inference_loss
+        reg_loss = tf.add_n(reg_losses)
+        if self.params.get('enable_reg_summaries'):
             tf.summary.scalar(
                 'inference_loss', inference_loss, family='sublosses')
-            reg_loss = tf.add_n(reg_losses)
             tf.summary.scalar('reg_loss', reg_loss, family='sublosses')
-            loss = inference_loss + reg_loss
-        else:
-            loss = inference_loss
-        return loss
+        return inference_loss + reg_loss
 
-    def get_estimator_spec(self, features, labels, mode, config=None):
-        """See `tf.estmator.EstimatorSpec`."""
-        inference = self.get_inference(features, mode)
-        predictions = self.get_predictions(inference)
-        spec_kwargs = dict(mode=mode, predictions=predictions)
+    @property
+    def inference_dtype(self):
+        """
+        Floating point dtype the forward pass runs in.
+
+        Set `params['dtype']` to 'float16' or 'bfloat16' to run inference in
+        reduced precision, halving activation memory traffic (and using
+        tensor cores on hardware that has them). Losses and metrics are
+        still computed in float32: float32 features are cast down on the way
+        in and inference outputs are cast back up. Note that training in
+        float16 typically requires loss scaling in `get_train_op`.
+        """
+        return tf.as_dtype(self.params.get('dtype', 'float32'))
 
-        if mode == tf.estimator.ModeKeys.PREDICT:
-            return tf.estimator.EstimatorSpec(**spec_kwargs)
+    def _cast_floats(self, tensors, from_dtypes, to_dtype):
+        """Cast all tensors in a structure from `from_dtypes` to `to_dtype`."""
+        def cast(tensor):
+            if tensor.dtype in from_dtypes:
+                return tf.cast(tensor, to_dtype)
+            return tensor
+        return tf.nest.map_structure(cast, tensors)
 
-        inference_loss = self.get_inference_loss(inference, labels)
-        loss = self.get_total_loss(inference_loss)
-        spec_kwargs['loss'] = loss
+    def _get_inference(self, features, mode):
+        """
+        Get inference, optionally traced and/or in reduced precision.
 
-        if mode == tf.estimator.ModeKeys.EVAL:
-            spec_kwargs['eval_metric_ops'] = self.get_eval_metric_ops(
-                predictions, labels)
-            return tf.estimator.EstimatorSpec(**spec_kwargs)
+        If `params['use_tracing']` is True and the installed tensorflow
+        provides `tf.function`, the forward pass for each (mode, graph) is
+        traced once and cached, avoiding per-call python dispatch. Otherwise
+        this just calls `get_inference` directly.
 
+        See `inference_dtype` for reduced-precision behaviour.
+        """
+        dtype = self.inference_dtype
+        if dtype != tf.float32:
+            features = self._cast_floats(features, (tf.float32,), dtype)
+        if self.params.get('use_tracing') and hasattr(tf, 'function'):
+            traced_fns = self._graph_cache('traced_inference')
+            if mode not in traced_fns:
+                def inference_fn(features):
+                    inference = self.get_inference(features, mode)
+                    if mode != tf.estimator.ModeKeys.TRAIN:
+                        return inference
+                    # The traced FuncGraph copies UPDATE_OPS by value at
+                    # trace start, so update ops created by the forward pass
+                    # (e.g. batch normalization) never reach the outer
+                    # graph's collection read by _get_train_spec. Attach
+                    # them to the outputs here so the guarantee in
+                    # get_train_op's docstring still holds under tracing.
+                    update_ops = tf.get_collection(tf.GraphKeys.UPDATE_OPS)
+                    with tf.control_dependencies(update_ops):
+                        return tf.nest.map_structure(tf.identity, inference)
+                traced_fns[mode] = tf.function(
+                    inference_fn, autograph=True,
+                    experimental_relax_shapes=True)
+            inference = traced_fns[mode](features)
+        else:
+            inference = self.get_inference(features, mode)
+        if dtype != tf.float32:
+            inference = self._cast_floats(
+                inference, (tf.float16, tf.bfloat16), tf.float32)
+        return inference
+
+    def _get_predict_spec(self, features, labels):
+        mode = tf.estimator.ModeKeys.PREDICT
+        inference = self._get_inference(features, mode)
+        return tf.estimator.EstimatorSpec(
+            mode=mode, predictions=self.get_predictions(inference))
+
+    def _get_eval_spec(self, features, labels):
+        mode = tf.estimator.ModeKeys.EVAL
+        inference = self._get_inference(features, mode)
+        predictions = self.get_predictions(inference)
+        loss = self.get_total_loss(
+            self.get_inference_loss(inference, labels))
+        return tf.estimator.EstimatorSpec(
+            mode=mode, predictions=predictions, loss=loss,
+            eval_metric_ops=self.get_eval_metric_ops(predictions, labels))
+
+    def _get_train_spec(self, features, labels):
+        mode = tf.estimator.ModeKeys.TRAIN
+        inference = self._get_inference(features, mode)
+        predictions = self.get_predictions(inference)
+        loss = self.get_total_loss(
+            self.get_inference_loss(inference, labels))
         step = tf.train.get_or_create_global_step()
-        update_ops = tf.get_collection(tf.GraphKeys.UPDATE_OPS)
+        update_ops = self._get_cached_collection(tf.GraphKeys.UPDATE_OPS)
         with tf.control_dependencies(update_ops):
             train_op = self.get_train_op(loss=loss, step=step)
-        spec_kwargs['train_op'] = train_op
+        return tf.estimator.EstimatorSpec(
+            mode=mode, predictions=predictions, loss=loss,
+            train_op=train_op)
 
-        if mode == tf.estimator.ModeKeys.TRAIN:
-            return tf.estimator.EstimatorSpec(**spec_kwargs)
+    def get_estimator_spec(self, features, labels, mode, config=None):
+        """See `tf.estimator.EstimatorSpec`."""
+        if mode not in self._spec_fns:
+            raise ValueError('Unrecognized mode %s' % mode)
+        return self._spec_fns[mode](features, labels)
 
-        raise ValueError('Unrecognized mode %s' % mode)
+    def _apply_tfdata_options(self, dataset):
+        """
+        Apply tf.data's static graph optimizations to `dataset`.
+
+        These rewrites (map fusion, map+batch fusion, shuffle+repeat fusion,
+        no-op elimination) are off by default upstream; applying them
+        centrally means every subclass pipeline benefits. Element order is
+        allowed to be non-deterministic for throughput unless
+        `params['deterministic_data']` is set.
+        """
+        opts = tf.data.Options()
+        optimization = opts.experimental_optimization
+        optimization.map_fusion = True
+        optimization.map_and_batch_fusion = True
+        optimization.shuffle_and_repeat_fusion = True
+        optimization.noop_elimination = True
+        opts.experimental_deterministic = self.params.get(
+            'deterministic_data', False)
+        return dataset.with_options(opts)
+
+    def _get_batch(self, dataset):
+        """
+        Get next-element tensors from `dataset`.
+
+        Uses an initializable iterator rather than a one-shot iterator, which
+        avoids capturing all dataset state into the graph via python closures
+        (slow to initialize for large in-memory datasets). The initializer is
+        added to the TABLE_INITIALIZERS collection, so `MonitoredSession`s
+        and `Estimator`s run it automatically; callers managing raw sessions
+        can run the collection themselves to reset the iterator.
+        """
+        iterator = dataset.make_initializable_iterator()
+        tf.add_to_collection(
+            tf.GraphKeys.TABLE_INITIALIZERS, iterator.initializer)
+        return iterator.get_next()
+
+    def _memoized_dataset(self, key, build_fn):
+        """
+        Memoize `build_fn()` for the current default graph.
+
+        Datasets belong to the graph that is active when they are built, so
+        entries live in the per-graph cache (weakly keyed, see
+        `_graph_cache`). Repeated input construction on the same graph
+        (e.g. profiling flows that build inputs and spec together) reuses
+        the python-side pipeline and only re-creates the cheap iterator
+        ops.
+        """
+        cache = self._graph_cache('datasets')
+        if key not in cache:
+            cache[key] = build_fn()
+        return cache[key]
+
+    def _build_train_dataset(self, repeat_count, shuffle_buffer_size):
+        dataset = self._apply_tfdata_options(self.get_train_dataset())
+        dataset = dataset.apply(tf.data.experimental.shuffle_and_repeat(
+            shuffle_buffer_size, count=repeat_count))
+        map_fn = self.get_train_map_fn()
+        if map_fn is None:
+            dataset = dataset.batch(self.batch_size)
+        else:
+            dataset = dataset.apply(tf.data.experimental.map_and_batch(
+                map_fn, self.batch_size,
+                num_parallel_calls=tf.data.experimental.AUTOTUNE))
+        vectorized_map_fn = self.get_vectorized_map_fn()
+        if vectorized_map_fn is not None:
+            dataset = dataset.map(
+                vectorized_map_fn,
+                num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        if self.params.get('vectorize_maps'):
+            opts = tf.data.Options()
+            opts.experimental_optimization.map_vectorization.enabled = True
+            dataset = dataset.with_options(opts)
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
+        device = self.params.get('prefetch_to_device')
+        if device is not None:
+            dataset = dataset.apply(
+                tf.data.experimental.prefetch_to_device(device))
+        return dataset
 
     def get_train_inputs(
             self, shuffle=True, repeat_count=None, shuffle_buffer_size=10000):
         """
         Get all features and labels for training.
 
+        Batches are prefetched so host-side batch preparation overlaps with
+        accelerator compute. If `params['prefetch_to_device']` is set (e.g.
+        '/device:GPU:0'), batches are additionally prefetched to that device.
+
         Returns (features, labels), where each of (features, labels) can be
         a tensor, or possibly nested list/tuple/dict.
         """
-        dataset = self.get_train_dataset()
-        dataset = dataset.shuffle(shuffle_buffer_size).repeat(
-            count=repeat_count)
-        dataset = dataset.batch(self.batch_size)
-        features, labels = dataset.make_one_shot_iterator().get_next()
+        dataset = self._memoized_dataset(
+            (tf.estimator.ModeKeys.TRAIN, repeat_count, shuffle_buffer_size),
+            lambda: self._build_train_dataset(
+                repeat_count, shuffle_buffer_size))
+        features, labels = self._get_batch(dataset)
         return features, labels
 
+    def _build_eval_dataset(self):
+        dataset = self._apply_tfdata_options(self.get_eval_dataset())
+        cache_filename = self.params.get('eval_cache_filename')
+        if cache_filename is not None:
+            dataset = dataset.cache(cache_filename)
+        map_fn = self.get_eval_map_fn()
+        if map_fn is not None:
+            dataset = dataset.map(
+                map_fn, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        dataset = dataset.batch(self.batch_size)
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
+        return dataset
+
     def get_eval_inputs(self):
         """
         Get all features and labels for evlauation.
 
+        If `params['eval_cache_filename']` is set, the eval dataset is
+        written to that cache file on its first pass and later `eval()`
+        calls read it back instead of re-reading/decoding the source data.
+        An in-memory cache is deliberately not offered: each
+        `Estimator.evaluate` call builds a fresh single-pass graph, so a
+        memory cache would be repopulated every call and never reused.
+
         Returns (features, labels), where each of (features, labels) can be
         a tensor, or possibly nested list/tuple/dict.
         """
-        dataset = self.get_eval_dataset()
-        dataset = dataset.batch(self.batch_size)
-        features, labels = dataset.make_one_shot_iterator().get_next()
+        dataset = self._memoized_dataset(
+            tf.estimator.ModeKeys.EVAL, self._build_eval_dataset)
+        features, labels = self._get_batch(dataset)
         return features, labels
 
+    def _build_predict_dataset(self):
+        dataset = self._apply_tfdata_options(self.get_predict_dataset())
+        map_fn = self.get_predict_map_fn()
+        if map_fn is not None:
+            dataset = dataset.map(
+                map_fn, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        dataset = dataset.batch(self.batch_size)
+        dataset = dataset.prefetch(tf.data.experimental.AUTOTUNE)
+        return dataset
+
     def get_predict_inputs(self):
         """
         Abstract method that returns all features required by the model.
@@ -207,9 +551,9 @@ class ModelBuilder(object):
         Returned value can be a single tensor, or possibly nested
         list/tuple/dict.
         """
-        dataset = self.get_predict_dataset()
-        dataset = dataset.batch(self.batch_size)
-        features = dataset.make_one_shot_iterator().get_next()
+        dataset = self._memoized_dataset(
+            tf.estimator.ModeKeys.PREDICT, self._build_predict_dataset)
+        features = self._get_batch(dataset)
         return features, None
 
     def get_inputs(self, mode):
@@ -221,17 +565,51 @@ class ModelBuilder(object):
             * `get_eval_inputs`
             * `get_predict_inputs`.
         """
-        if mode == tf.estimator.ModeKeys.TRAIN:
-            return self.get_train_inputs()
-        elif mode == tf.esitmator.ModeKeys.EVAL:
-            return self.get_eval_inputs()
-        elif mode == tf.esitmator.ModeKeys.INFER:
-            return self.get_predict_inputs()
+        input_fns = {
+            tf.estimator.ModeKeys.TRAIN: self.get_train_inputs,
+            tf.estimator.ModeKeys.EVAL: self.get_eval_inputs,
+            tf.estimator.ModeKeys.PREDICT: self.get_predict_inputs,
+        }
+        if mode not in input_fns:
+            raise ValueError('Unrecognized mode %s' % mode)
+        return input_fns[mode]()
+
+    def _get_default_run_config(self):
+        """
+        Synthesize a `tf.estimator.RunConfig` from params.
+
+        Exposes thread pool sizes via `params['inter_op']`/`params['intra_op']`
+        (0, the default, lets tensorflow pick based on the host), and turns
+        on XLA jit compilation of the graph when `params['enable_xla']` is
+        set.
+        """
+        session_config = tf.ConfigProto(
+            inter_op_parallelism_threads=self.params.get('inter_op', 0),
+            intra_op_parallelism_threads=self.params.get('intra_op', 0),
+            allow_soft_placement=True)
+        if self.params.get('enable_xla'):
+            session_config.graph_options.optimizer_options.global_jit_level \
+                = tf.OptimizerOptions.ON_1
+        return tf.estimator.RunConfig(session_config=session_config)
 
     def get_estimator(self, config=None):
-        """Get the `tf.estimator.Estimator` defined by this builder."""
-        return tf.estimator.Estimator(
-            self.get_estimator_spec, self.model_dir, config=config)
+        """
+        Get the `tf.estimator.Estimator` defined by this builder.
+
+        If no config is provided, one is synthesized from params via
+        `_get_default_run_config`.
+
+        Estimators are cached per config object, so multi-phase workflows
+        (train -> eval -> predict) reuse the same python-side estimator
+        rather than re-parsing model_dir and warm-start state each call.
+        """
+        key = config
+        if key not in self._estimator_cache:
+            if config is None:
+                config = self._get_default_run_config()
+            self._estimator_cache[key] = tf.estimator.Estimator(
+                self.get_estimator_spec, self.model_dir, config=config)
+        return self._estimator_cache[key]
 
     def train(self, config=None, **train_kwargs):
         """Wrapper around `tf.estimator.Estimator.train`."""
@@ -248,43 +626,106 @@ class ModelBuilder(object):
         estimator = self.get_estimator(config=config)
         return estimator.evaluate(self.get_eval_inputs, **eval_kwargs)
 
-    def vis_inputs(self, mode=tf.estimator.ModeKeys.TRAIN):
+    def _vis_loop(self, mode, get_fetches, vis_fn):
         """
-        Visualize inputs defined by this model according.
+        Build a single graph/session and call `vis_fn` on each fetched batch.
 
-        Depends on `vis_example_data` implementation.
+        `get_fetches` maps (features, labels) to the list of tensors fetched
+        each step; the fetch list is compiled into a session callable once,
+        outside the loop.
+
+        Uses a plain `tf.Session` rather than a `MonitoredSession` - nothing
+        here trains, so the session-manager/coordinator/summary-writer
+        machinery is pure setup overhead. Initializers (including the input
+        iterators registered by `_get_batch`) are run explicitly.
         """
         graph = tf.Graph()
         with graph.as_default():
-            if mode == tf.estimator.ModeKeys.PREDICT:
-                features, labels = self.get_predict_inputs()
-            elif mode == tf.estimator.ModeKeys.TRAIN:
-                features, labels = self.get_train_inputs()
+            features, labels = self.get_inputs(mode)
+            fetches = get_fetches(features, labels)
+
+            with tf.Session() as sess:
+                sess.run(tf.global_variables_initializer())
+                initializers = tf.get_collection(
+                    tf.GraphKeys.TABLE_INITIALIZERS)
+                if initializers:
+                    sess.run(initializers)
+                fetch = sess.make_callable(fetches)
+
+                def batches():
+                    try:
+                        while True:
+                            yield fetch()
+                    except tf.errors.OutOfRangeError:
+                        return
+
+                for data in _prefetched(batches()):
+                    vis_fn(*data)
+
+    def vis_inputs(self, mode=tf.estimator.ModeKeys.TRAIN):
+        """
+        Visualize inputs defined by this model according.
 
-            with tf.train.MonitoredSession() as sess:
-                while not sess.should_stop():
-                    feature_data, label_data = sess.run([features, labels])
-                    self.vis_example_data(feature_data, label_data)
+        Depends on `vis_example_data` implementation.
+        """
+        self._vis_loop(
+            mode, lambda features, labels: [features, labels],
+            self.vis_example_data)
 
     def vis_predictions(self, mode=tf.estimator.ModeKeys.TRAIN):
         """
         Visualize inputs and predictions defined by this model.
 
+        Runs inference via `tf.estimator.Estimator.predict` rather than a
+        manually constructed graph/saver, so the graph is built and the
+        checkpoint restored once by the estimator. `predict` discards the
+        labels half of the input_fn tuple, so labels are routed through the
+        features structure; predictions, features and labels are flattened
+        into the flat dict of tensors `EstimatorSpec` requires and
+        reassembled per batch, so `vis_prediction_data` still receives
+        (predictions, features, labels) with their original structure.
+
         Depends on `vis_prediction_data` implementation.
         """
-        graph = tf.Graph()
-        with graph.as_default():
-            if mode == tf.estimator.ModeKeys.PREDICT:
-                features, labels = self.get_predict_inputs()
-            elif mode == tf.estimator.ModeKeys.TRAIN:
-                features, labels = self.get_train_inputs()
-
-            predictions = self.get_estimator_spec(
-                features, labels, tf.estimator.ModeKeys.PREDICT).predictions
-            saver = tf.train.Saver()
-
-            with tf.train.MonitoredSession() as sess:
-                saver.restore(sess, tf.train.latest_checkpoint(self.model_dir))
-                while not sess.should_stop():
-                    data = sess.run([predictions, features, labels])
-                    self.vis_prediction_data(*data)
+        if mode not in (tf.estimator.ModeKeys.TRAIN,
+                        tf.estimator.ModeKeys.EVAL,
+                        tf.estimator.ModeKeys.PREDICT):
+            raise ValueError('Unrecognized mode %s' % mode)
+
+        def input_fn():
+            features, labels = self.get_inputs(mode)
+            packed = dict(features=features)
+            if labels is not None:
+                packed['labels'] = labels
+            return packed
+
+        # tensor-valued structure recorded by model_fn, used below to
+        # restore the structure of the flattened numpy outputs.
+        templates = []
+
+        def model_fn(features, labels, mode, config=None):
+            labels = features.get('labels')
+            spec = self.get_estimator_spec(
+                features['features'], labels,
+                tf.estimator.ModeKeys.PREDICT, config)
+            template = dict(
+                predictions=spec.predictions, features=features['features'])
+            if labels is not None:
+                template['labels'] = labels
+            templates.append(template)
+            predictions = {
+                str(i): tensor
+                for i, tensor in enumerate(tf.nest.flatten(template))}
+            return tf.estimator.EstimatorSpec(
+                mode=tf.estimator.ModeKeys.PREDICT, predictions=predictions)
+
+        estimator = tf.estimator.Estimator(
+            model_fn, self.model_dir, config=self._get_default_run_config())
+        _warm_checkpoint_cache(tf.train.latest_checkpoint(self.model_dir))
+        batches = estimator.predict(input_fn, yield_single_examples=False)
+        for data in _prefetched(batches):
+            batch = tf.nest.pack_sequence_as(
+                templates[-1], [data[str(i)] for i in range(len(data))])
+            self.vis_prediction_data(
+                batch['predictions'], batch['features'],
+                batch.get('labels'))